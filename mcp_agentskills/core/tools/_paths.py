@@ -0,0 +1,82 @@
+"""Path and file helpers shared by the skill tool operations.
+
+The skills directory is configured once via
+``C.service_config.metadata["skill_dir"]``; resolving it is memoized here so
+that the tool operations do not repeat the symlink resolution on every call.
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from flowllm.core.context import C
+
+# Leading YAML frontmatter block of a SKILL.md file (optionally preceded by a UTF-8 BOM).
+FRONTMATTER_RE = re.compile(rb"\A(?:\xef\xbb\xbf)?---[ \t\r]*\n(.*?)\n---[ \t\r]*(?:\n|\Z)", re.DOTALL)
+
+
+@lru_cache(maxsize=1)
+def resolved_skill_dir() -> Path:
+    """Return the absolute, symlink-resolved skills directory.
+
+    The result is cached for the lifetime of the process. Call
+    ``resolved_skill_dir.cache_clear()`` if ``skill_dir`` is changed at runtime.
+
+    Returns:
+        Path: The resolved skills directory.
+    """
+    return Path(C.service_config.metadata["skill_dir"]).resolve()
+
+
+def skill_file_path(skill_name: str, file_name: str) -> str | None:
+    """Build the path of ``file_name`` inside the ``skill_name`` skill directory.
+
+    The path is joined as a plain string and normalized lexically (no
+    filesystem access). Paths that would escape the skills directory, e.g.
+    through ``..`` segments, are rejected.
+
+    Args:
+        skill_name: The name of the skill directory.
+        file_name: A file name or path relative to the skill directory.
+
+    Returns:
+        str | None: The normalized file path, or None if it lies outside the
+            skills directory.
+    """
+    root = str(resolved_skill_dir())
+    path = os.path.normpath(f"{root}/{skill_name}/{file_name}")
+    if not path.startswith(root.rstrip(os.sep) + os.sep):
+        return None
+    return path
+
+
+def read_small(path: str) -> bytes:
+    """Read a (typically small) file with a single ``os.read`` call.
+
+    Skips the buffered ``io`` stack used by ``open()``/``Path.read_text``:
+    the file size comes from ``os.fstat`` and the content is read in one go,
+    looping only if the kernel returns fewer bytes than requested.
+
+    Args:
+        path: The path of the file to read.
+
+    Returns:
+        bytes: The raw file content.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        NotADirectoryError: If a parent component of the path is not a directory.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    return data
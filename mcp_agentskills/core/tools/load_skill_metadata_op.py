@@ -14,17 +14,207 @@ file and returned a string in the format:
 This string can be used to display all available skills.
 """
 
+import asyncio
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
 
+import yaml
 from loguru import logger
 
 from flowllm.core.context import C
-from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 
+from ._paths import FRONTMATTER_RE, read_small
+from .skill_dir_op import SkillDirOp
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+
+# First line of the rendered metadata; each skill is appended as its own line.
+_METADATA_HEADER = 'Available skills (each line is "- <skill_name>: <skill_description>"):'
+
+# Shared pool used to read SKILL.md files concurrently off the event loop.
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="skill_metadata_io")
+
+# Bump whenever the parsing or rendering of skill metadata changes, so that
+# snapshots written by an older version are not reused.
+_SNAPSHOT_VERSION = 4
+
+
+def _scandir_skill_md(root: str) -> Iterator[os.DirEntry]:
+    """Recursively yield the directory entries of all SKILL.md files under ``root``.
+
+    Uses ``os.scandir`` so that the file type of each entry comes from the
+    cached ``DirEntry`` data instead of an extra ``stat()`` per entry.
+    As with ``Path.rglob``, symlinked directories are not descended into,
+    SKILL.md symlinks to files are listed, and directories that cannot be
+    listed are skipped.
+
+    Args:
+        root: The directory to scan.
+
+    Yields:
+        os.DirEntry: The entry of each SKILL.md file found.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError as e:
+        logger.warning(f"⚠️ Skipping unreadable directory {root}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_skill_md(entry.path)
+            elif entry.name == "SKILL.md" and entry.is_file():
+                yield entry
+
+
+def _parse_frontmatter_lines(frontmatter: str) -> dict[str, str]:
+    """Extract the ``name`` and ``description`` lines from frontmatter that is not valid YAML.
+
+    Each value is taken verbatim after the first colon of its line, with
+    surrounding quotes removed.
+    """
+    data = {}
+    for line in frontmatter.split("\n"):
+        line = line.strip()
+        if line.startswith("name:"):
+            data["name"] = line.split(":", 1)[1].strip().strip("\"'")
+        elif line.startswith("description:"):
+            data["description"] = line.split(":", 1)[1].strip().strip("\"'")
+    return data
+
+
+@lru_cache(maxsize=2048)
+def _parse_cached(path: str, mtime_ns: int, size: int) -> tuple[str, str] | None:
+    """Read and parse one SKILL.md file, memoized on its path, mtime and size.
+
+    ``mtime_ns`` and ``size`` are only part of the cache key: a modified file
+    gets a new key and is re-read, while unchanged files are served from memory.
+
+    Returns:
+        tuple[str, str] | None: The ``(name, description)`` pair, or None if
+            the file has no valid metadata.
+    """
+    metadata = LoadSkillMetadataOp.parse_skill_metadata(read_small(path), path)
+    if metadata is None:
+        return None
+    return metadata["name"], metadata["description"]
+
+
+def _build_manifest(files: list[os.DirEntry]) -> dict[str, list[int]]:
+    """Map each SKILL.md path to its ``[st_mtime_ns, st_size]`` pair.
+
+    The manifest is used to detect whether any SKILL.md file was added,
+    removed or modified since the metadata snapshot was written. Symlinks
+    are followed, so editing the target of a symlinked SKILL.md counts as
+    a modification.
+    """
+    manifest = {}
+    for entry in files:
+        st = entry.stat()
+        manifest[entry.path] = [st.st_mtime_ns, st.st_size]
+    return manifest
+
+
+def _owned_by_current_user(st: os.stat_result) -> bool:
+    """Return whether ``st`` belongs to the current user (always True where uids do not exist)."""
+    return not hasattr(os, "getuid") or st.st_uid == os.getuid()
+
+
+def _snapshot_dir() -> Path | None:
+    """Return the private per-user directory holding metadata snapshots.
+
+    The directory lives under ``$XDG_CACHE_HOME`` (``~/.cache`` by default)
+    and is created with mode 0700. None is returned if it cannot be created
+    or is not a directory private to the current user, so that no other
+    user can plant or swap a snapshot.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    snapshot_dir = Path(cache_home) / "agentskills"
+    try:
+        snapshot_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.stat(snapshot_dir, follow_symlinks=False)
+    except OSError as e:
+        logger.warning(f"⚠️ Skill metadata snapshot directory unavailable: {e}")
+        return None
+    if not stat.S_ISDIR(st.st_mode) or not _owned_by_current_user(st) or st.st_mode & 0o077:
+        logger.warning(f"⚠️ Not using skill metadata snapshots: {snapshot_dir} is not private to the current user")
+        return None
+    return snapshot_dir
+
+
+def _snapshot_path(skill_dir: str) -> Path | None:
+    """Return the on-disk snapshot location for the given skills directory, or None if unavailable."""
+    snapshot_dir = _snapshot_dir()
+    if snapshot_dir is None:
+        return None
+    digest = hashlib.sha1(skill_dir.encode("utf-8")).hexdigest()[:12]
+    return snapshot_dir / f"meta_{digest}.json"
+
+
+def _load_snapshot(skill_dir: str) -> dict | None:
+    """Load the metadata snapshot for ``skill_dir``, or None if unavailable.
+
+    Snapshots not owned by the current user are ignored.
+    """
+    snapshot_path = _snapshot_path(skill_dir)
+    if snapshot_path is None:
+        return None
+    try:
+        with open(snapshot_path, "rb") as f:
+            if not _owned_by_current_user(os.fstat(f.fileno())):
+                logger.warning(f"⚠️ Ignoring skill metadata snapshot not owned by the current user: {snapshot_path}")
+                return None
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Ignoring unreadable skill metadata snapshot: {e}")
+        return None
+
+
+def _write_snapshot(skill_dir: str, manifest: dict[str, list[int]], rendered: str):
+    """Persist the rendered metadata string together with its manifest.
+
+    The snapshot is written to a fresh ``mkstemp`` file in the snapshot
+    directory first and then atomically moved into place, so concurrent
+    readers never observe a partial file.
+    """
+    snapshot_path = _snapshot_path(skill_dir)
+    if snapshot_path is None:
+        return
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=snapshot_path.parent, prefix=f"{snapshot_path.name}.", suffix=".tmp")
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": _SNAPSHOT_VERSION, "manifest": manifest, "rendered": rendered},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, snapshot_path)
+    except OSError as e:
+        logger.warning(f"⚠️ Failed to write skill metadata snapshot: {e}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
 
 @C.register_op()
-class LoadSkillMetadataOp(BaseAsyncToolOp):
+class LoadSkillMetadataOp(SkillDirOp):
     """Operation for loading metadata from all available skills.
 
     This tool scans the skills directory recursively for SKILL.md files and
@@ -70,7 +260,7 @@ class LoadSkillMetadataOp(BaseAsyncToolOp):
         return ToolCall(**tool_params)
 
     @staticmethod
-    async def parse_skill_metadata(content: str, path: str) -> dict[str, str] | None:
+    def parse_skill_metadata(content: bytes, path: str) -> dict[str, str] | None:
         """Extract skill metadata (name and description) from SKILL.md content.
 
         Parses YAML frontmatter from SKILL.md files to extract the skill name
@@ -82,43 +272,46 @@ class LoadSkillMetadataOp(BaseAsyncToolOp):
         ---
         ```
 
-        The method splits the content by "---" delimiters to extract the
-        frontmatter section, then parses each line to find the 'name' and
-        'description' fields. Values can be quoted or unquoted.
+        The method matches only the leading frontmatter block with a
+        pre-compiled regex, so the (usually much larger) body is never split
+        or decoded, then loads it with PyYAML's safe loader (the libyaml C
+        implementation when available). Any valid YAML scalar is accepted,
+        including quoted, multi-line and block-scalar values. Frontmatter
+        that is not valid YAML falls back to reading the ``name:`` and
+        ``description:`` lines as plain text.
 
         Args:
-            content: The full content of the SKILL.md file as a string.
+            content: The raw content of the SKILL.md file as UTF-8 bytes.
             path: The file path (used for logging purposes when parsing fails).
 
         Returns:
             dict[str, str] | None: A dictionary with 'name' and 'description'
                 keys containing the extracted values, or None if:
-                - No YAML frontmatter is found (less than 3 parts after splitting)
+                - No YAML frontmatter is found at the start of the file
+                - The frontmatter is neither a YAML mapping nor readable line by line
                 - The 'name' field is missing or empty
                 - The 'description' field is missing or empty
         """
-        # Split content by YAML frontmatter delimiters (---)
-        # Expected format: "---\n...frontmatter...\n---\n...content..."
-        # This should result in at least 3 parts: [before, frontmatter, after]
-        parts = content.split("---")
-        if len(parts) < 3:
+        # Match only the frontmatter: "---\n...frontmatter...\n---\n...content..."
+        match = FRONTMATTER_RE.match(content)
+        if not match:
             logger.warning(f"No YAML frontmatter found in skill from {path}")
             return None
 
-        # Extract the frontmatter section (between the first two "---" delimiters)
-        frontmatter_text = parts[1].strip()
-        name = None
-        description = None
-
-        # Parse each line in the frontmatter to find name and description
-        for line in frontmatter_text.split("\n"):
-            line = line.strip()
-            if line.startswith("name:"):
-                # Extract value after "name:", remove quotes if present
-                name = line.split(":", 1)[1].strip().strip("\"'")
-            elif line.startswith("description:"):
-                # Extract value after "description:", remove quotes if present
-                description = line.split(":", 1)[1].strip().strip("\"'")
+        try:
+            data = yaml.load(match.group(1), Loader=_SafeLoader)
+        except yaml.YAMLError as e:
+            # Not strict YAML (e.g. an unquoted description containing ": "):
+            # fall back to reading the plain "name:" / "description:" lines
+            logger.warning(f"Invalid YAML frontmatter in skill from {path}, falling back to line parsing: {e}")
+            data = _parse_frontmatter_lines(match.group(1).decode("utf-8", errors="replace"))
+
+        if not isinstance(data, dict):
+            logger.warning(f"YAML frontmatter is not a mapping in skill from {path}")
+            return None
+
+        name = str(data.get("name") or "").strip()
+        description = str(data.get("description") or "").strip()
 
         # Validate that both required fields are present
         if not name or not description:
@@ -140,9 +333,10 @@ class LoadSkillMetadataOp(BaseAsyncToolOp):
         The method:
         1. Gets the skills directory path from the service_config
         2. Recursively searches for all SKILL.md files
-        3. Parses each file's frontmatter to extract metadata
-        4. Builds a string with skill names and their descriptions
-        5. Sets the output with the complete metadata string
+        3. Returns the snapshotted result if no SKILL.md file has changed
+        4. Parses each file's frontmatter to extract metadata
+        5. Builds a string with skill names and their descriptions
+        6. Snapshots and sets the output with the complete metadata string
 
         Returns:
             None: The result is set via `self.set_output()` with a string
@@ -159,31 +353,48 @@ class LoadSkillMetadataOp(BaseAsyncToolOp):
             a warning but does not stop the process.
         """
         # Get the skills directory path from service_config
-        skill_dir = Path(C.service_config.metadata["skill_dir"]).resolve()
-        logger.info(f"🔧 Tool called: load_skill_metadata(path={skill_dir})")
+        skill_dir = self.skill_root
+        self._log_tool_call("load_skill_metadata")
 
         # Recursively find all SKILL.md files in the skills directory
-        skill_files = list(skill_dir.rglob("SKILL.md"))
+        skill_root = str(skill_dir)
+        skill_files = list(_scandir_skill_md(skill_root))
         assert skill_files, "No SKILL.md files found in skills directory"
 
+        # Reuse the rendered metadata if no SKILL.md file changed since the last snapshot
+        manifest = _build_manifest(skill_files)
+        snapshot = _load_snapshot(skill_root)
+        if snapshot and snapshot.get("version") == _SNAPSHOT_VERSION and snapshot.get("manifest") == manifest:
+            logger.info(f"✅ Loaded {len(manifest)} skill metadata entries from snapshot")
+            self.set_output(snapshot["rendered"])
+            return
+
+        # Read and parse all SKILL.md files concurrently on the shared I/O pool,
+        # reusing the in-process parse results of files that did not change
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(_IO_POOL, _parse_cached, path, mtime_ns, size)
+                for path, (mtime_ns, size) in manifest.items()
+            ],
+        )
+
         # Add skill metadatas to agent context
         skill_num = 0
-        skill_metadata_context = 'Available skills (each line is "- <skill_name>: <skill_description>"):'
-        for skill_file in skill_files:
-            # Read the SKILL.md file content
-            content = skill_file.read_text(encoding="utf-8")
-            # Parse metadata from the file's frontmatter
-            metadata = await self.parse_skill_metadata(content, str(skill_file))
-
+        lines = [_METADATA_HEADER]
+        for skill_file, metadata in zip(manifest, results):
             if metadata:
                 skill_num += 1
                 # Get the parent directory of the SKILL.md file as the skill directory
-                skill_dir = skill_file.parent.as_posix()
-                name = metadata["name"]
-                description = metadata["description"]
-                skill_metadata_context += f"\n- {name}: {description}"
+                skill_dir = os.path.dirname(skill_file)
+                name, description = metadata
+                lines.append(f"- {name}: {description}")
                 logger.info(f"✅ Loaded skill {name} metadata skill_dir={skill_dir}")
 
+        cache_info = _parse_cached.cache_info()
+        logger.info(f"skill metadata parse cache: hits={cache_info.hits} misses={cache_info.misses}")
+        skill_metadata_context = "\n".join(lines)
         logger.info(f"✅ Loaded {skill_num} skill metadata entries")
+        _write_snapshot(skill_root, manifest, skill_metadata_context)
         # Set the output with the complete metadata string
         self.set_output(skill_metadata_context)
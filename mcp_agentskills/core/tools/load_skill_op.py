@@ -7,17 +7,17 @@ SKILL.md file contains YAML frontmatter, only the content after the
 frontmatter is returned; otherwise, the full file content is returned.
 """
 
-from pathlib import Path
-
 from loguru import logger
 
 from flowllm.core.context import C
-from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 
+from ._paths import FRONTMATTER_RE, read_small, skill_file_path
+from .skill_dir_op import SkillDirOp
+
 
 @C.register_op()
-class LoadSkillOp(BaseAsyncToolOp):
+class LoadSkillOp(SkillDirOp):
     """Operation for loading a specific skill's instructions.
 
     This tool loads the content of a SKILL.md file for a given skill name.
@@ -39,7 +39,7 @@ class LoadSkillOp(BaseAsyncToolOp):
     Note:
         - The skill_name must exist in `C.service_config.metadata["skill_dir"]`
         - The SKILL.md file must exist in the skill directory
-        - YAML frontmatter is detected by splitting on "---" delimiters
+        - YAML frontmatter is detected as in LoadSkillMetadataOp (optional BOM, LF or CRLF)
     """
 
     def build_tool_call(self) -> ToolCall:
@@ -83,10 +83,9 @@ class LoadSkillOp(BaseAsyncToolOp):
         1. Extracts the skill_name from input_dict
         2. Gets the skill directory from {service_config.metadata["skill_dir"]} / {skill_name}
         3. Constructs the path to SKILL.md file
-        4. Checks if the file exists
-        5. Reads the file content
-        6. Splits content by "---" to detect YAML frontmatter
-        7. Returns content after frontmatter if present, otherwise full content
+        4. Reads the file content, reporting a missing file as not found
+        5. Locates the closing "---" of the YAML frontmatter, if any
+        6. Returns content after frontmatter if present, otherwise full content
 
         Returns:
             None: The result is set via `self.set_output()` with one of:
@@ -109,21 +108,32 @@ class LoadSkillOp(BaseAsyncToolOp):
         # Look up the skill directory from the metadata dictionary
         # This dictionary should be populated by LoadSkillMetadataOp
         # skill_dir = Path(self.context.skill_metadata_dict[skill_name]["skill_dir"])
-        skill_dir = Path(C.service_config.metadata["skill_dir"]).resolve()
-        logger.info(f"🔧 Tool called: load_skill(skill_name='{skill_name}') with skill_dir={skill_dir}")
+        self._log_tool_call("load_skill", skill_name=skill_name)
 
         # Construct the path to the SKILL.md file
-        skill_path = skill_dir / skill_name / "SKILL.md"
+        skill_path = skill_file_path(skill_name, "SKILL.md")
+        if skill_path is None:
+            content = f"❌ Skill '{skill_name}' is outside the skills directory"
+            logger.warning(content)
+            self.set_output(content)
+            return
 
-        # Check if the SKILL.md file exists
-        if not skill_path.exists():
+        # Read the SKILL.md file content; a missing file means an unknown skill
+        try:
+            raw = read_small(skill_path)
+        except (FileNotFoundError, NotADirectoryError):
             content = f"❌ Skill '{skill_name}' not found"
             logger.exception(content)
             self.set_output(content)
             return
 
-        # Read the SKILL.md file content
-        content: str = skill_path.read_text(encoding="utf-8")
+        # Strip the YAML frontmatter ("---\n...\n---\n") with the same match as the metadata
+        # parser (allowing a BOM and CRLF line endings), without splitting the body
+        match = FRONTMATTER_RE.match(raw)
+        if match:
+            raw = raw[match.end() :].lstrip(b"\r\n")
+        content = raw.decode("utf-8")
+
         self.set_output(content)
 
         logger.info(f"✅ Loaded skill: {skill_name} size={len(content)}")
@@ -6,17 +6,17 @@ The skill directory is read from {service_config.metadata["skill_dir"]} /
 {skill_name}. If the file is not found, an error message is returned.
 """
 
-from pathlib import Path
-
 from loguru import logger
 
 from flowllm.core.context import C
-from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 
+from ._paths import read_small, skill_file_path
+from .skill_dir_op import SkillDirOp
+
 
 @C.register_op()
-class ReadReferenceFileOp(BaseAsyncToolOp):
+class ReadReferenceFileOp(SkillDirOp):
     """Operation for reading reference files from a skill directory.
 
     This tool allows reading reference files like forms.md, reference.md,
@@ -41,6 +41,7 @@ class ReadReferenceFileOp(BaseAsyncToolOp):
           relative path within the skill directory
         - File encoding is assumed to be UTF-8
         - The file path is constructed as: {skill_dir}/{file_name}
+        - Paths resolving outside the skills directory (e.g. via "..") are rejected
     """
 
     def build_tool_call(self) -> ToolCall:
@@ -91,9 +92,8 @@ class ReadReferenceFileOp(BaseAsyncToolOp):
         1. Extracts the skill_name and file_name from input_dict
         2. Gets the skill directory from {service_config.metadata["skill_dir"]} / {skill_name}
         3. Constructs the file path as {skill_dir}/{file_name}
-        4. Checks if the file exists
-        5. Reads the file content if it exists
-        6. Returns the file content or an error message if not found
+        4. Reads the file content, reporting a missing file as not found
+        5. Returns the file content or an error message if not found
 
         Returns:
             None: The result is set via `self.set_output()` with one of:
@@ -113,19 +113,22 @@ class ReadReferenceFileOp(BaseAsyncToolOp):
         skill_name = self.input_dict["skill_name"]
         file_name = self.input_dict["file_name"]
         # skill_dir = Path(self.context.skill_metadata_dict[skill_name]["skill_dir"])
-        skill_dir = Path(C.service_config.metadata["skill_dir"]).resolve()
-        logger.info(
-            f"🔧 Tool called: read_reference_file(skill_name='{skill_name}', file_name='{file_name}') "
-            f"with skill_dir={skill_dir}",
-        )
+        self._log_tool_call("read_reference_file", skill_name=skill_name, file_name=file_name)
+
+        file_path = skill_file_path(skill_name, file_name)
+        if file_path is None:
+            content = f"File '{file_name}' in skill '{skill_name}' is outside the skills directory"
+            logger.warning(content)
+            self.set_output(content)
+            return
 
-        file_path = skill_dir / skill_name / file_name
-        if not file_path.exists():
+        try:
+            result = read_small(file_path).decode("utf-8")
+        except (FileNotFoundError, NotADirectoryError):
             content = f"File '{file_name}' not found in skill '{skill_name}'"
             logger.exception(content)
             self.set_output(content)
             return
 
-        result = file_path.read_text(encoding="utf-8")
         logger.info(f"✅ Read file: {skill_name}/{file_name} size={len(result)}")
         self.set_output(result)
@@ -8,19 +8,145 @@ resources.
 """
 
 import asyncio
+import io
+import json
 import os
+import re
+import shlex
 import shutil
-from pathlib import Path
+from functools import lru_cache
 
 from loguru import logger
 
 from flowllm.core.context import C
-from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 
+from ._paths import skill_file_path
+from .skill_dir_op import SkillDirOp
+
+# Characters that only /bin/sh can interpret: pipes, command lists,
+# redirections, subshells, expansions, globs, comments and line continuations.
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`*?~#\[\]{}\\\n]")
+
+# Python interpreters or *.py files at token boundaries; unlike a plain
+# substring check this does not fire for "copy", "deploy", "py_backup", ...
+_PY_CMD_RE = re.compile(r"""(?:^|[\s/])(?:python[0-9.]*|py)\b|\.py(?:[\s;&|"')]|$)""")
+
+# Per-skill file recording the *.py mtime at the last successful dependency install.
+_DEPS_STATE_FILE = ".agentskills_deps.json"
+
+# Common builtins that have no executable of their own and need a shell to run; any other
+# command that is not found on PATH also falls back to the shell.
+_SHELL_BUILTINS = frozenset({".", "alias", "cd", "eval", "exec", "exit", "export", "set", "source", "ulimit", "unset"})
+
+
+def _split_command(command: str) -> list[str] | None:
+    """Split ``command`` into argv if it can be executed without a shell.
+
+    Args:
+        command: The command line requested by the caller.
+
+    Returns:
+        list[str] | None: The argv to execute directly, or None if the command
+            uses shell syntax (pipes, ``&&``, redirections, variables, globs,
+            builtins such as ``cd``, ``VAR=value`` prefixes) or cannot be parsed.
+    """
+    if _SHELL_SYNTAX_RE.search(command):
+        return None
+
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
+
+
+@lru_cache(maxsize=1)
+def _pipreqs_path() -> str | None:
+    """Return the path of the pipreqs executable, looked up on PATH only once."""
+    return shutil.which("pipreqs")
+
+
+def _max_py_mtime_ns(root: str) -> int:
+    """Return the newest mtime (in ns) of all *.py files under ``root``, or 0 if none.
+
+    Hidden directories (e.g. ``.git``, ``.venv``) are skipped.
+    """
+    max_mtime_ns = 0
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        max_mtime_ns = max(max_mtime_ns, _max_py_mtime_ns(entry.path))
+                elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                    max_mtime_ns = max(max_mtime_ns, entry.stat(follow_symlinks=False).st_mtime_ns)
+    except OSError:
+        pass
+    return max_mtime_ns
+
+
+def _load_deps_mtime(skill_path: str) -> int | None:
+    """Return the *.py mtime recorded at the last successful dependency install, if any."""
+    try:
+        with open(os.path.join(skill_path, _DEPS_STATE_FILE), "rb") as f:
+            return json.loads(f.read()).get("max_py_mtime_ns")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_deps_mtime(skill_path: str, max_py_mtime_ns: int):
+    """Record the *.py mtime of a successful dependency install."""
+    try:
+        with open(os.path.join(skill_path, _DEPS_STATE_FILE), "w", encoding="utf-8") as f:
+            json.dump({"max_py_mtime_ns": max_py_mtime_ns}, f)
+    except OSError as e:
+        logger.warning(f"⚠️ Failed to record dependency install state: {e}")
+
+
+@lru_cache(maxsize=8)
+def _render_tool_desc(template: str, skill_dir: str) -> str:
+    """Format the tool description template, memoized across op instances.
+
+    A new op instance is built for every flow call, so without this cache the
+    description would be re-formatted each time the tool schema is built.
+    """
+    return template.format(skill_dir=skill_dir)
+
+
+async def _drain(stream: asyncio.StreamReader, max_bytes: int) -> bytes:
+    """Read ``stream`` until EOF, keeping at most ``max_bytes`` of it.
+
+    Reading continues after the cap is reached so that the child process never
+    blocks on a full pipe; the excess is discarded and a truncation marker is
+    appended to the returned data.
+
+    Args:
+        stream: The stdout or stderr stream of a subprocess.
+        max_bytes: Maximum number of bytes to keep.
+
+    Returns:
+        bytes: The captured data, ending with a truncation marker if it was cut.
+    """
+    buffer = io.BytesIO()
+    truncated = False
+    while chunk := await stream.read(65536):
+        remaining = max_bytes - buffer.tell()
+        if len(chunk) > remaining:
+            truncated = True
+            chunk = chunk[: max(remaining, 0)]
+        buffer.write(chunk)
+
+    if truncated:
+        buffer.write(b"\n...[truncated]...")
+    return buffer.getvalue()
+
 
 @C.register_op()
-class RunShellCommandOp(BaseAsyncToolOp):
+class RunShellCommandOp(SkillDirOp):
     """Operation for running shell commands in a subprocess.
 
     This tool executes shell commands and can automatically detect and
@@ -39,32 +165,36 @@ class RunShellCommandOp(BaseAsyncToolOp):
 
     Returns:
         str: The combined stdout and stderr output from the command execution.
-            The output is decoded as UTF-8 and stripped of leading/trailing
+            The output is decoded as UTF-8 (invalid bytes are replaced) and stripped of leading/trailing
             whitespace, with stdout and stderr concatenated with a newline.
 
     Note:
         - The skill_name must exist in `C.service_config.metadata["skill_dir"]`
-        - The command is executed in the skill's directory using `cd {skill_dir}/{skill_name} && {command}`
-        - For Python commands (containing "py"), the tool attempts to auto-install
+        - The command is executed in the skill's directory using `cd {skill_dir}/{skill_name} && {command}`;
+          commands without shell syntax are executed directly (no /bin/sh) in the same working directory
+        - For Python commands (running a Python interpreter or a .py file), the tool attempts to auto-install
           dependencies using pipreqs if it's available in the system PATH and
           the auto_install_deps parameter is enabled
         - If pipreqs is not available or dependency installation fails, a warning
           is logged but the command execution continues
-        - The subprocess uses the current environment variables (os.environ.copy())
+        - The subprocess inherits the current environment variables
     """
 
     file_path: str = __file__
 
-    def __init__(self, auto_install_deps: bool = False, **kwargs):
+    def __init__(self, auto_install_deps: bool = False, max_output_bytes: int = 1024 * 1024, **kwargs):
         """Initialize RunShellCommandOp.
 
         Args:
             auto_install_deps: If True, enables automatic dependency installation for Python
                 commands. Defaults to False.
+            max_output_bytes: Maximum number of bytes kept from each of stdout and stderr;
+                anything beyond is dropped and marked as truncated. Defaults to 1 MiB.
             **kwargs: Additional keyword arguments passed to parent class.
         """
         super().__init__(**kwargs)
         self.auto_install_deps: bool = auto_install_deps
+        self.max_output_bytes: int = max_output_bytes
 
     def build_tool_call(self) -> ToolCall:
         """Build the tool call definition for run_shell_command.
@@ -85,9 +215,7 @@ class RunShellCommandOp(BaseAsyncToolOp):
         return ToolCall(
             **{
                 "name": "run_shell_command",
-                "description": self.get_prompt("tool_desc").format(
-                    skill_dir=Path(C.service_config.metadata["skill_dir"]).resolve(),
-                ),
+                "description": _render_tool_desc(self.get_prompt("tool_desc"), str(self.skill_root)),
                 "input_schema": {
                     "skill_name": {
                         "type": "string",
@@ -103,6 +231,52 @@ class RunShellCommandOp(BaseAsyncToolOp):
             },
         )
 
+    @staticmethod
+    async def _auto_install_deps(skill_path: str):
+        """Install the Python dependencies of a skill with pipreqs and pip.
+
+        The install is skipped when the newest *.py file in the skill directory
+        is the same as at the last successful install, as recorded in the
+        skill's `.agentskills_deps.json` file. pipreqs and pip are executed
+        directly (no shell) with the skill directory as working directory.
+
+        Args:
+            skill_path: The normalized skill directory inside the skills directory,
+                as returned by `skill_file_path(skill_name, ".")`.
+        """
+        pipreqs_path = _pipreqs_path()
+        if pipreqs_path is None:
+            logger.info("❗️ pipreqs not found, skipping dependency auto-install.")
+            return
+
+        py_mtime_ns = _max_py_mtime_ns(skill_path)
+        if py_mtime_ns == _load_deps_mtime(skill_path):
+            logger.info("✅ Dependencies are up to date, skipping dependency auto-install.")
+            return
+
+        # Run pipreqs and pip without a shell, inside the skill directory
+        outputs = []
+        for argv in ([pipreqs_path, ".", "--force"], ["pip", "install", "-r", "requirements.txt"]):
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    cwd=skill_path,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to install dependencies: {e}")
+                return
+            stdout, stderr = await proc.communicate()
+            output = f"{stdout.decode('utf-8', 'replace')}\n{stderr.decode('utf-8', 'replace')}"
+            if proc.returncode != 0:
+                logger.warning(f"⚠️ Failed to install dependencies:\n{output}")
+                return
+            outputs.append(output)
+
+        logger.info("✅ Dependencies installed successfully.\n" + "\n".join(outputs))
+        _write_deps_mtime(skill_path, py_mtime_ns)
+
     async def async_execute(self):
         """Execute the shell command operation.
 
@@ -113,17 +287,19 @@ class RunShellCommandOp(BaseAsyncToolOp):
         The method:
         1. Extracts skill_name and command from input_dict
         2. Looks up the skill directory from skill_metadata_dict
-        3. For Python commands (containing "py"), checks if pipreqs is available
-        4. If pipreqs is available, generates requirements.txt and installs dependencies
-        5. Constructs the full command as `cd {skill_dir} && {command}`
+        3. For Python commands (running a Python interpreter or a .py file), checks if pipreqs is available
+        4. If pipreqs is available and a *.py file changed since the last install,
+           generates requirements.txt and installs dependencies
+        5. Executes commands without shell syntax directly, and everything else (including
+           commands not found on PATH, such as shell builtins) through /bin/sh
         6. Executes the command in a subprocess with the current environment
-        7. Captures stdout and stderr output
+        7. Streams stdout and stderr output, keeping at most max_output_bytes of each
         8. Returns the combined output (stdout + stderr)
 
         Returns:
             None: The result is set via `self.set_output()` with the combined
                 stdout and stderr output from the command execution. The output
-                is decoded as UTF-8 and formatted as: "{stdout}\n{stderr}"
+                is decoded as UTF-8, replacing invalid bytes, and formatted as: "{stdout}\n{stderr}"
 
         Raises:
             KeyError: If skill_name is not found in skill_metadata_dict.
@@ -131,53 +307,73 @@ class RunShellCommandOp(BaseAsyncToolOp):
                 called before RunShellCommandOp.
 
         Note:
-            - Dependency auto-installation only occurs for commands containing "py"
-              and when the auto_install_deps parameter is enabled
+            - Dependency auto-installation only occurs for commands that run a Python
+              interpreter or a .py file and when the auto_install_deps parameter is enabled
             - If pipreqs is not available, a warning is logged but execution continues
+            - With auto_install_deps enabled, a skill_name resolving outside the skills
+              directory is rejected before anything is installed
+            - The install is skipped if no *.py file in the skill directory changed
+              since the last successful install (tracked in `.agentskills_deps.json`)
             - If dependency installation fails, a warning is logged but the command
               is still executed
             - The command runs in the skill's directory, allowing access to
               skill-specific files and resources
             - Environment variables from the current process are passed to the subprocess
+            - Output beyond max_output_bytes per stream is dropped and replaced by
+              a "...[truncated]..." marker
         """
         # Extract skill name and command from input parameters
         skill_name = self.input_dict["skill_name"]
         command: str = self.input_dict["command"]
 
-        skill_dir = Path(C.service_config.metadata["skill_dir"]).resolve()
-        logger.info(f"🔧 run shell command: skill_name={skill_name} skill_dir={skill_dir} command={command}")
+        self._log_tool_call("run_shell_command", skill_name=skill_name, command=command)
 
         # Auto-install dependencies for Python scripts if pipreqs is available
         # This helps ensure that Python scripts have their required dependencies
         # Only install if auto_install_deps parameter is enabled
-        if self.auto_install_deps:
-            if "py" in command:
-                pipreqs_available = shutil.which("pipreqs") is not None
-                if pipreqs_available:
-                    install_cmd = f"cd {skill_dir}/{skill_name} && pipreqs . --force && pip install -r requirements.txt"
-                    proc = await asyncio.create_subprocess_shell(
-                        install_cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-                    stdout, stderr = await proc.communicate()
-                    if proc.returncode != 0:
-                        logger.warning(f"⚠️ Failed to install dependencies:\n{stdout.decode()}\n{stderr.decode()}")
-                    else:
-                        logger.info(f"✅ Dependencies installed successfully.\n{stdout.decode()}\n{stderr.decode()}")
-                else:
-                    logger.info("❗️ pipreqs not found, skipping dependency auto-install.")
-
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=os.environ.copy(),
-        )
+        if self.auto_install_deps and _PY_CMD_RE.search(command):
+            # Never install into (or write install state to) a path outside the skills directory
+            skill_path = skill_file_path(skill_name, ".")
+            if skill_path is None:
+                output = f"❌ Skill '{skill_name}' is outside the skills directory"
+                logger.warning(output)
+                self.set_output(output)
+                return
+            await self._auto_install_deps(skill_path)
 
-        # Wait for the command to complete and capture output
-        stdout, stderr = await proc.communicate()
-        # Combine stdout and stderr output, decoded as UTF-8
-        output = stdout.decode().strip() + "\n" + stderr.decode().strip()
+        # Execute plain commands directly, skipping the extra /bin/sh process; fall back to
+        # the shell for shell syntax. Both paths share the server's working directory.
+        proc = None
+        argv = _split_command(command)
+        if argv is not None:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError:
+                # No such executable, e.g. a builtin like `command -v` or `type`: let /bin/sh run it
+                proc = None
+            except OSError as e:
+                output = f"❌ Failed to run command: {e}"
+                logger.warning(output)
+                self.set_output(output)
+                return
+        if proc is None:
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
+        # Stream stdout and stderr concurrently with a bounded buffer, then wait for the command to complete
+        stdout, stderr = await asyncio.gather(
+            _drain(proc.stdout, self.max_output_bytes),
+            _drain(proc.stderr, self.max_output_bytes),
+        )
+        await proc.wait()
+        # Combine stdout and stderr output before decoding once; invalid UTF-8 bytes are replaced
+        output = b"\n".join([stdout.strip(), stderr.strip()]).decode("utf-8", "replace")
         logger.info(f"✅ Command executed: skill_name={skill_name} output={output}")
         self.set_output(output)
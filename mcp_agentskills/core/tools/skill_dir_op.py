@@ -0,0 +1,48 @@
+"""Common base class for operations working inside the skills directory.
+
+This module provides the SkillDirOp class shared by all skill tool
+operations. It exposes the resolved skills directory and a helper that logs
+tool invocations in a uniform format.
+"""
+
+from functools import cached_property
+from pathlib import Path
+
+from loguru import logger
+
+from flowllm.core.op import BaseAsyncToolOp
+
+from ._paths import resolved_skill_dir
+
+
+class SkillDirOp(BaseAsyncToolOp):
+    """Base class for tool operations rooted at the configured skills directory.
+
+    Subclasses use `self.skill_root` instead of resolving
+    `C.service_config.metadata["skill_dir"]` themselves, and
+    `self._log_tool_call()` to log their invocation.
+
+    Note:
+        This class is not registered as an operation; only its subclasses are.
+    """
+
+    @cached_property
+    def skill_root(self) -> Path:
+        """The absolute, symlink-resolved skills directory."""
+        return resolved_skill_dir()
+
+    def _log_tool_call(self, name: str, **kwargs):
+        """Log a tool invocation as `🔧 Tool called: name(key='value', ...) with skill_dir=...`.
+
+        The message is rendered lazily, only if the INFO level is enabled.
+
+        Args:
+            name: The tool name.
+            **kwargs: The tool arguments to include in the message.
+        """
+        logger.opt(lazy=True, depth=1).info(
+            "🔧 Tool called: {}({}) with skill_dir={}",
+            lambda: name,
+            lambda: ", ".join(f"{key}={value!r}" for key, value in kwargs.items()),
+            lambda: self.skill_root,
+        )
@@ -5,21 +5,254 @@ you can implement Agent Skills by passing the MCP tools
 registered by the AgentSkills MCP service to the tools parameter.
 """
 
+import re
 import json
-import datetime
-from typing import Dict
+import secrets
+import asyncio
+import importlib.util
+import time
+from typing import Deque, Dict, Iterator, List, Set, Tuple
+from collections import deque
+from itertools import chain, count
+from dataclasses import dataclass, field
+import httpx
 from loguru import logger
-from jinja2 import Template
 from skill_agent_prompt import SYSTEM_PROMPT, SYSTEM_PROMPT_ZH
 
 from flowllm.core.enumeration import Role
 from flowllm.core.llm import OpenAICompatibleLLM
 from flowllm.core.schema import Message, ToolCall
+from flowllm.core.schema.message import ContentBlock
 from flowllm.core.utils import load_env, FastMcpClient
 
-
 load_env()
 
+MCP_URL = "http://0.0.0.0:8001/sse"
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_TASK_COMPLETE_RE = re.compile(r"\btask_complete\W*$", re.IGNORECASE)
+# Read-only tools; the calls to them in one step run concurrently. Any other tool (i.e.
+# run_shell_command) may have side effects, so its calls run one at a time in issue order.
+CONCURRENT_TOOL_NAMES = frozenset({"load_skill_metadata", "load_skill", "read_reference_file"})
+# Tools whose results differ on every call; they never get a prompt-cache breakpoint.
+NO_CACHE_TOOL_NAMES = frozenset({"run_shell_command"})
+# Tools whose stale results may be cut by the sliding window; skill instructions and
+# reference files are kept since the agent follows them for the rest of the task.
+TRUNCATABLE_TOOL_NAMES = frozenset({"run_shell_command"})
+# Tool results longer than this are cut down to their head and tail before entering the history.
+LARGE_RESULT_CHARS = 64 * 1024
+RESULT_EDGE_CHARS = 8 * 1024
+AGENT_TOOL_NAMES = ("load_skill_metadata", "load_skill", "read_reference_file", "run_shell_command")
+
+# System prompts split once around their only variable, so rendering is a plain concatenation
+# and everything but the timestamp stays byte-identical for provider prompt caching.
+_PROMPT_PARTS: Dict[str, Tuple[str, str, str]] = {
+    "en": SYSTEM_PROMPT.lstrip().partition("{time}"),
+    "zh": SYSTEM_PROMPT_ZH.lstrip().partition("{time}"),
+}
+# Latest rendered system prompt per language, as `(unix_second, prompt)`.
+_RENDERED_PROMPTS: Dict[str, Tuple[int, str]] = {}
+
+# Tool schemas per MCP server URL; they are static for the server's lifetime,
+# so they are listed (and their JSON dumps rendered) once per process.
+_TOOL_CACHE: Dict[str, Dict[str, ToolCall]] = {}
+
+
+async def _load_tools(mcp_client: "PooledMcpClient", url: str) -> Dict[str, ToolCall]:
+    """Return the cached tool dict for `url`, listing the agent's tools on a cache miss.
+
+    Only the tools in `AGENT_TOOL_NAMES` are kept; listing stops as soon as all of them are found.
+    """
+    cached = _TOOL_CACHE.get(url)
+    if cached is not None:
+        return cached
+
+    tool_dict: Dict[str, ToolCall] = {}
+    for tool_call in await mcp_client.list_tool_calls(names=set(AGENT_TOOL_NAMES)):
+        tool_dict[tool_call.name] = tool_call
+
+        # Log the tool call schema in Qwen3-compatible format for debugging.
+        # (This is the standard "tool" format for Qwen3 / BaiLian.)
+        # The indented dump is only rendered when INFO is actually emitted.
+        logger.opt(lazy=True).info(
+            "tool_call {} {}",
+            lambda name=tool_call.name: name,
+            lambda tc=tool_call: json.dumps(tc.simple_input_dump(), ensure_ascii=False, indent=2),
+        )
+
+    missing = [name for name in AGENT_TOOL_NAMES if name not in tool_dict]
+    if missing:
+        raise RuntimeError(f"MCP server at {url} does not provide the tools {missing}")
+
+    _TOOL_CACHE[url] = tool_dict
+    return tool_dict
+
+
+def _last_cache_breakpoint(messages: List[Message]) -> int:
+    """Return the index of the last message `_with_cache_control` marks: the latest tool result not
+    flagged `no_cache`, or the first user message when there is none."""
+    for index in range(len(messages) - 1, 1, -1):
+        message = messages[index]
+        if message.role == Role.TOOL and not message.metadata.get("no_cache"):
+            return index
+    return 1
+
+
+def _with_cache_control(messages: List[Message]) -> List[Message]:
+    """Return a copy of `messages` with `cache_control` breakpoints for the provider's prompt cache.
+
+    The breakpoints go on the system prompt and the first user message (the prefix shared by every
+    step of a run) and on the latest tool result that is not flagged `no_cache`, so the provider
+    reuses the prefix up to the loaded skill documents. The prefix only hits the cache if it is
+    byte-identical to the previous request, which `SkillAgent._truncate_stale_results` respects.
+    The stored history stays plain strings.
+    """
+    marked = {0, 1, _last_cache_breakpoint(messages)}
+    result = list(messages)
+    for index in marked:
+        message = messages[index]
+        if isinstance(message.content, str):
+            block = ContentBlock(type="text", text=message.content, cache_control={"type": "ephemeral"})
+            result[index] = message.model_copy(update={"content": [block]})
+    return result
+
+
+async def _call_in_order(call_tool, tool_calls: List[Tuple[ToolCall, dict]]) -> list:
+    """Await `call_tool` for each `(tool_call, arguments)` one at a time; a failed call yields its exception."""
+    results = []
+    for tool_call, arguments in tool_calls:
+        try:
+            results.append(await call_tool(tool_call.name, arguments=arguments, parse_result=True))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _render_system_prompt(language: str) -> str:
+    """Return the system prompt for `language` with the current time, rendering it at most once per second.
+
+    All agents and runs started within the same second share the identical string, which keeps
+    provider prompt caches warm.
+    """
+    now = int(time.time())
+    cached = _RENDERED_PROMPTS.get(language)
+    if cached is not None and cached[0] == now:
+        return cached[1]
+
+    prefix, _, suffix = _PROMPT_PARTS[language]
+    rendered = prefix + time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)) + suffix
+    _RENDERED_PROMPTS[language] = (now, rendered)
+    return rendered
+
+
+class PooledMcpClient(FastMcpClient):
+    """A `FastMcpClient` whose HTTP transport runs on a bounded, keep-alive httpx pool.
+
+    Besides the `FastMcpClient` keys, the config accepts `max_connections`,
+    `max_keepalive_connections` and `keepalive_expiry`. HTTP/2 is used when `h2` is installed.
+    """
+
+    def _create_transport(self):
+        """Create the transport and make HTTP transports build their client with `_create_httpx_client`."""
+        transport = super()._create_transport()
+        if hasattr(transport, "httpx_client_factory"):
+            transport.httpx_client_factory = self._create_httpx_client
+        return transport
+
+    def _create_httpx_client(
+        self,
+        headers: dict | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+    ) -> httpx.AsyncClient:
+        """Create the httpx client used by one MCP session for its event stream and requests."""
+        limits = httpx.Limits(
+            max_connections=self.config.get("max_connections", 500),
+            max_keepalive_connections=self.config.get("max_keepalive_connections", 100),
+            keepalive_expiry=self.config.get("keepalive_expiry", 30),
+        )
+        return httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout or httpx.Timeout(30.0, read=300.0),
+            auth=auth,
+            limits=limits,
+            http2=_HTTP2,
+            follow_redirects=True,
+        )
+
+    async def list_tool_calls(self, names: Set[str] | None = None) -> List[ToolCall]:
+        """List the server's tools as ToolCall objects, optionally only those in `names`.
+
+        With `names`, the `tools/list` pages are fetched one at a time and listing stops as
+        soon as every requested tool has been seen.
+        """
+        if names is None:
+            return await super().list_tool_calls()
+        if not self.client:
+            raise RuntimeError(f"Server {self.name} not initialized")
+
+        tool_calls: List[ToolCall] = []
+        cursor: str | None = None
+        while True:
+            result = await asyncio.wait_for(self.client.list_tools_mcp(cursor=cursor), timeout=self.timeout)
+            tool_calls.extend(ToolCall.from_mcp_tool(tool) for tool in result.tools if tool.name in names)
+            if len(tool_calls) >= len(names) or not result.nextCursor or result.nextCursor == cursor:
+                return tool_calls
+            cursor = result.nextCursor
+
+
+def _compact_tool(tool_call: ToolCall) -> ToolCall:
+    """Return a copy of `tool_call` without the tool and parameter descriptions."""
+    return tool_call.model_copy(
+        update={
+            "description": "",
+            "input_schema": {
+                name: attr.model_copy(update={"description": ""}) for name, attr in tool_call.input_schema.items()
+            },
+        },
+    )
+
+
+def _is_task_complete(content) -> bool:
+    """Return True if the assistant's reply ends with the "task_complete" marker.
+
+    Tolerates surrounding whitespace, case, trailing punctuation and markdown such as `task_complete`.
+    """
+    return isinstance(content, str) and _TASK_COMPLETE_RE.search(content) is not None
+
+
+def _summarize_result(text: str) -> str:
+    """Return the first and last `RESULT_EDGE_CHARS` characters of a large tool result and what was cut."""
+    omitted = len(text) - 2 * RESULT_EDGE_CHARS
+    return f"{text[:RESULT_EDGE_CHARS]}\n[... {omitted} chars omitted ...]\n{text[-RESULT_EDGE_CHARS:]}"
+
+
+def _preview(text: str, size: int = 200) -> str:
+    """Return `text` shortened to its first and last `size` characters for logging."""
+    if len(text) <= 2 * size:
+        return text
+    return f"{text[:size]} ... {text[-size:]}"
+
+
+@dataclass
+class _RunState:
+    """Conversation and bookkeeping of one agent run."""
+
+    # System prompt and user query; fixed for the whole run.
+    head: List[Message]
+    # One entry per step: the assistant message followed by its tool results.
+    tail: Deque[List[Message]]
+    # Names of the tools already called in this run.
+    called_tools: Set[str] = field(default_factory=set)
+    step: int = 0
+    # Prefix and counter for the ids of tool calls the LLM returned without one.
+    run_id: str = field(default_factory=lambda: secrets.token_hex(6))
+    call_ids: Iterator[int] = field(default_factory=count)
+
+    @property
+    def messages(self) -> List[Message]:
+        """The conversation as sent to the LLM."""
+        return list(chain(self.head, chain.from_iterable(self.tail)))
+
 
 class SkillAgent:
     """A simple ReAct-style agent that does skill-based reasoning.
@@ -49,6 +282,13 @@ class SkillAgent:
         model_name: str = "qwen3_30b_instruct",
         max_steps: int = 50,
         language: str = "",
+        tool_result_window: int | None = None,
+        tool_result_max_chars: int = 500,
+        prompt_cache: bool = False,
+        compact_used_tools: bool = False,
+        mcp_max_connections: int = 500,
+        mcp_max_keepalive_connections: int = 100,
+        max_history_steps: int | None = None,
     ):
         """Initialize the skill agent with configuration.
 
@@ -58,104 +298,392 @@ class SkillAgent:
             max_steps: Maximum number of reasoning steps the agent can take.
                 Default is 5. Note: This is passed as max_retries to the parent.
             prompt_path: Path to the prompt file. Default is "skill_agent_prompt.yaml".
+            tool_result_window: Number of most recent steps whose `run_shell_command` output is sent
+                to the LLM in full. Older outputs longer than `tool_result_max_chars` are replaced by
+                a short placeholder in the request (the returned history keeps them) to bound the
+                prompt size. Skill instructions and reference files are never truncated. With
+                `prompt_cache`, outputs already inside the cached prefix are kept in full, so the
+                window only shrinks the uncached tail. Default is None, which sends every result
+                in full.
+            tool_result_max_chars: Tool results up to this length are never truncated. Default is 500.
+            prompt_cache: Mark the static prompt prefix and the latest cacheable tool result with
+                Anthropic-style `cache_control` breakpoints, for providers with explicit prompt
+                caching (e.g. DashScope). Default is False.
+            compact_used_tools: Once a tool has been called in a run, send its schema without the
+                tool and parameter descriptions for the rest of the run. This shrinks the tools
+                payload, but the model no longer sees usage rules kept in those descriptions (e.g.
+                the `cd` convention of run_shell_command). Default is False.
+            mcp_max_connections: Connection limit of the pooled httpx client behind the MCP session.
+                Default is 500.
+            mcp_max_keepalive_connections: Idle keep-alive connections kept by that pool. Default is 100.
+            max_history_steps: Keep only the last N steps after the system prompt and query; older
+                steps are dropped whole, so tool calls and their results stay paired. Default is
+                None, which keeps the full history.
         """
         self.llm = OpenAICompatibleLLM(model_name=model_name)
         self.max_steps = max_steps
         self.language = language
-        if self.language == "zh":
-            self.prompt = Template(SYSTEM_PROMPT_ZH.lstrip())
-        else:
-            self.prompt = Template(SYSTEM_PROMPT.lstrip())
+        self.tool_result_window = tool_result_window
+        self.tool_result_max_chars = tool_result_max_chars
+        self.prompt_cache = prompt_cache
+        self.compact_used_tools = compact_used_tools
+        self.mcp_max_connections = mcp_max_connections
+        self.mcp_max_keepalive_connections = mcp_max_keepalive_connections
+        self.max_history_steps = max_history_steps
+        self._prompt_language = "zh" if self.language == "zh" else "en"
 
-    async def run(self, query: str):
-        """Run the skill agent with the given query.
+        # MCP session and tool schemas, shared by all runs until disconnect().
+        self._mcp_client: FastMcpClient | None = None
+        self._tool_dict: Dict[str, ToolCall] = {}
+        self._active_tools: List[ToolCall] = []
+        self._compact_tools: Dict[str, ToolCall] = {}
+        self._connect_lock = asyncio.Lock()
 
-        Args:
-            query: The user's query.
+    async def connect(self):
+        """Open the MCP session and load the available tools.
 
-        Returns:
-            A string containing the agent's response.
+        The session and tool list are kept until `disconnect()` so that
+        subsequent `run()` calls skip the MCP handshake and tool listing.
         """
-        # Prepare all available tools from the MCP server.
-        tool_dict: Dict[str, ToolCall] = {}
-        async with FastMcpClient(
+        async with self._connect_lock:
+            if self._mcp_client is None:
+                await self._connect()
+
+    async def _connect(self):
+        """Open the MCP session and fetch the tools; callers must hold `_connect_lock`."""
+        mcp_client = PooledMcpClient(
             name="agentskills_mcp_client",
             config={
                 "type": "sse",
-                "url": "http://0.0.0.0:8001/sse",
+                "url": MCP_URL,
+                "max_connections": self.mcp_max_connections,
+                "max_keepalive_connections": self.mcp_max_keepalive_connections,
             },
-        ) as mcp_client:
-            tool_calls = await mcp_client.list_tool_calls()
-            for tool_call in tool_calls:
-                tool_dict[tool_call.name] = tool_call
-
-                # Log the tool call schema in Qwen3-compatible format for debugging.
-                # (This is the standard "tool" format for Qwen3 / BaiLian.)
-                tool_call_str = json.dumps(tool_call.simple_input_dump(), ensure_ascii=False, indent=2)
-                logger.info(f"tool_call {tool_call.name} {tool_call_str}")
-
-            logger.info(f"SkillAgent processing query: {query}")
-
-            # Get current time for the system prompt
-            now_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            # Build the initial conversation messages
-            messages = [
-                Message(
-                    role=Role.SYSTEM,
-                    content=self.prompt.render(
-                        {
-                            "time": now_time,
-                        },
-                    ),
-                ),
+        )
+        await mcp_client.__aenter__()
+
+        try:
+            tool_dict = await _load_tools(mcp_client, MCP_URL)
+        except Exception:
+            await mcp_client.__aexit__(None, None, None)
+            raise
+
+        self._mcp_client = mcp_client
+        self._tool_dict = tool_dict
+        # The tools offered to the LLM are the same on every step.
+        self._active_tools = [tool_dict[name] for name in AGENT_TOOL_NAMES]
+        self._compact_tools = {tool.name: _compact_tool(tool) for tool in self._active_tools}
+
+    async def disconnect(self):
+        """Close the MCP session opened by `connect()`."""
+        if self._mcp_client is None:
+            return
+
+        mcp_client, self._mcp_client = self._mcp_client, None
+        self._tool_dict = {}
+        self._active_tools = []
+        self._compact_tools = {}
+        await mcp_client.__aexit__(None, None, None)
+
+    async def __aenter__(self) -> "SkillAgent":
+        """Connect to the MCP server when entering the context."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Disconnect from the MCP server when leaving the context."""
+        await self.disconnect()
+
+    def _truncate_stale_results(self, messages: List[Message], step: int):
+        """Replace, in the request list `messages`, stale long results of `TRUNCATABLE_TOOL_NAMES`.
+
+        Results from steps before the last `tool_result_window` steps are swapped for a placeholder
+        copy; the messages stored in the run's history keep their content and only get a
+        `truncated` flag in their metadata, so a result stays truncated in every later request.
+        With `prompt_cache`, results up to the last cache breakpoint are never newly truncated,
+        keeping the cached prefix identical from step to step.
+        """
+        oldest_full_step = step - self.tool_result_window
+        first_index = _last_cache_breakpoint(messages) + 1 if self.prompt_cache else 0
+        for index, message in enumerate(messages):
+            metadata = message.metadata
+            content = message.content
+            if message.role != Role.TOOL or not isinstance(content, str):
+                continue
+            if not metadata.get("truncated") and (
+                index < first_index
+                or metadata.get("tool_name") not in TRUNCATABLE_TOOL_NAMES
+                or metadata["step"] >= oldest_full_step
+                or len(content) <= self.tool_result_max_chars
+            ):
+                continue
+            metadata["truncated"] = True
+            placeholder = f"[{metadata['tool_name']} result: {len(content)} chars, truncated — re-call to retrieve]"
+            messages[index] = message.model_copy(update={"content": placeholder})
+
+    def _step_tools(self, called_tools: Set[str]) -> List[ToolCall]:
+        """Return the tools for the next LLM call, compacting those already called if enabled."""
+        if not self.compact_used_tools or not called_tools:
+            return self._active_tools
+        return [self._compact_tools[tool.name] if tool.name in called_tools else tool for tool in self._active_tools]
+
+    def _new_run(self, query: str) -> _RunState:
+        """Build the initial state of a run for `query`."""
+        logger.info(f"SkillAgent processing query: {query}")
+
+        return _RunState(
+            head=[
+                Message(role=Role.SYSTEM, content=_render_system_prompt(self._prompt_language)),
                 Message(role=Role.USER, content=query),
+            ],
+            tail=deque(maxlen=self.max_history_steps),
+        )
+
+    async def _step(self, state: _RunState) -> bool:
+        """Run one ReAct step of `state`: ask the LLM, then execute the tool calls it requested.
+
+        The step's assistant and tool messages are added to `state.tail` and `state.step` is advanced.
+
+        Returns:
+            True if the model signalled that the task is complete.
+        """
+        i = state.step
+        state.step += 1
+
+        messages = state.messages
+        if self.tool_result_window is not None:
+            # Sliding window: only the latest steps' shell output is re-sent in full.
+            self._truncate_stale_results(messages, i)
+
+        # Ask the LLM what to do next.
+        # You can plug in your own tool-calling strategy here.
+        assistant_message: Message = await self.llm.achat(
+            messages=_with_cache_control(messages) if self.prompt_cache else messages,
+            tools=self._step_tools(state.called_tools),
+        )
+
+        # The step's messages enter the history as one unit, so dropping old steps never
+        # separates a tool call from its result.
+        step_messages = [assistant_message]
+        state.tail.append(step_messages)
+        logger.opt(lazy=True).debug(
+            "step={} content={}",
+            lambda: i,
+            lambda: (assistant_message.content or "")[:200],
+        )
+        # Stop as soon as the model signals completion, even if it also requested tools.
+        if _is_task_complete(assistant_message.content):
+            return True
+
+        if assistant_message.tool_calls:
+            tool_dict = self._tool_dict
+            call_tool = self._mcp_client.call_tool
+            append_message = step_messages.append
+
+            # (tool_call, parsed arguments) in call order; the arguments JSON is parsed once, and
+            # is None for unknown tools, which are answered with an error instead of being called.
+            tool_calls = []
+            for j, tool_call in enumerate(assistant_message.tool_calls):
+                # The tool message must reference the call it answers, so fill in missing ids.
+                if not tool_call.id:
+                    tool_call.id = f"{state.run_id}-{next(state.call_ids)}"
+
+                if tool_call.name not in tool_dict:
+                    logger.warning(f"unknown tool_call.name={tool_call.name}")
+                    tool_calls.append((tool_call, None))
+                    continue
+
+                arguments = tool_call.argument_dict
+                logger.info(f"round{i + 1}.{j} submit tool_calls={tool_call.name} argument={arguments}")
+                tool_calls.append((tool_call, arguments))
+
+            # Execute the tool calls of this turn via MCP and parse the results: read-only calls
+            # concurrently, the others one after another alongside them, in the order issued.
+            known = [k for k, (_, arguments) in enumerate(tool_calls) if arguments is not None]
+            sequential = [k for k in known if tool_calls[k][0].name not in CONCURRENT_TOOL_NAMES]
+            concurrent = [k for k in known if tool_calls[k][0].name in CONCURRENT_TOOL_NAMES]
+            sequential_results, *concurrent_results = await asyncio.gather(
+                _call_in_order(call_tool, [tool_calls[k] for k in sequential]),
+                *[call_tool(tool_calls[k][0].name, arguments=tool_calls[k][1], parse_result=True) for k in concurrent],
+                return_exceptions=True,
+            )
+            results = [None] * len(tool_calls)
+            for k, result in chain(zip(sequential, sequential_results), zip(concurrent, concurrent_results)):
+                results[k] = result
+
+            # Shrink oversized results (typically long shell output) off the event loop.
+            large = [
+                k for k, result in enumerate(results) if isinstance(result, str) and len(result) > LARGE_RESULT_CHARS
             ]
+            if large:
+                summaries = await asyncio.gather(*[asyncio.to_thread(_summarize_result, results[k]) for k in large])
+                for k, summary in zip(large, summaries):
+                    results[k] = summary
+
+            for (tool_call, arguments), result in zip(tool_calls, results):
+                no_cache = tool_call.name in NO_CACHE_TOOL_NAMES
+                if arguments is None:
+                    result = f"Error: unknown tool {tool_call.name}"
+                    no_cache = True
+                elif isinstance(result, Exception):
+                    logger.error(f"tool_call {tool_call.name} failed: {result!r}")
+                    result = f"Error: tool {tool_call.name} failed: {result}"
+                    no_cache = True
 
-            # Main ReAct loop.
-            for i in range(self.max_steps):
-                # Ask the LLM what to do next.
-                # You can plug in your own tool-calling strategy here.
-                assistant_message: Message = await self.llm.achat(
-                    messages=messages,
-                    tools=[
-                        tool_dict["load_skill_metadata"],
-                        tool_dict["load_skill"],
-                        tool_dict["read_reference_file"],
-                        tool_dict["run_shell_command"],
-                    ],
+                # Attach the tool result as a TOOL-role message so the LLM
+                # can see and reason about it in the next step.
+                append_message(
+                    Message(
+                        role=Role.TOOL,
+                        tool_call_id=tool_call.id,
+                        content=result,
+                        metadata={
+                            "tool_name": tool_call.name,
+                            "step": i,
+                            "no_cache": no_cache,
+                        },
+                    ),
                 )
+                state.called_tools.add(tool_call.name)
+                logger.opt(lazy=True).debug(
+                    "step={} tool={} result={} chars: {}",
+                    lambda: i,
+                    lambda: tool_call.name,
+                    lambda: len(result),
+                    lambda: _preview(result),
+                )
+
+        return False
 
-                messages.append(assistant_message)
-                print(i)
-                print(assistant_message.content)
-                if assistant_message.content == "task_complete":
+    async def run(self, query: str) -> List[Message]:
+        """Run the skill agent with the given query.
+
+        Args:
+            query: The user's query.
+
+        Returns:
+            The conversation messages, ending with the agent's final response. With
+            `max_history_steps`, only the steps still kept follow the system prompt and query.
+        """
+        # Reuse the MCP session across runs; connect lazily on the first run.
+        await self.connect()
+
+        state = self._new_run(query)
+
+        # Main ReAct loop.
+        while state.step < self.max_steps:
+            if await self._step(state):
+                break
+
+        return state.messages
+
+
+@dataclass
+class _PendingRun:
+    """A run inside `BatchedSkillAgent` and the future its caller waits on."""
+
+    state: _RunState
+    future: asyncio.Future
+
+
+class BatchedSkillAgent(SkillAgent):
+    """A `SkillAgent` that advances concurrent `run()` calls together, one ReAct step at a time.
+
+    Queries are queued and picked up by a single background worker. It waits up to `max_wait_ms`
+    for more queries to arrive (up to `max_batch` in flight), then issues the LLM requests of all
+    in-flight queries for the current step at once, so the serving backend can batch them.
+    Finished queries leave the batch immediately and queued ones join at the next step, in the
+    spirit of continuous batching.
+    """
+
+    def __init__(self, *args, max_batch: int = 8, max_wait_ms: float = 10, **kwargs):
+        """Initialize the batched agent.
+
+        Args:
+            max_batch: Maximum number of queries advanced together.
+            max_wait_ms: How long an idle worker waits for more queries before starting a batch.
+            *args, **kwargs: Passed to `SkillAgent`.
+        """
+        super().__init__(*args, **kwargs)
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+    async def run(self, query: str) -> List[Message]:
+        """Queue `query` for the next batch and wait for its conversation messages."""
+        await self.connect()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._serve())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    async def disconnect(self):
+        """Stop the batch worker, fail the queries still waiting, and close the MCP session."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("BatchedSkillAgent disconnected"))
+
+        await super().disconnect()
+
+    def _admit(self, batch: List[_PendingRun], query: str, future: asyncio.Future):
+        """Add a queued query to the batch unless its caller has already given up."""
+        if not future.done():
+            batch.append(_PendingRun(state=self._new_run(query), future=future))
+
+    async def _fill(self, batch: List[_PendingRun]):
+        """Top up `batch` from the queue, waiting up to `max_wait_ms` only when it is empty."""
+        if not batch:
+            self._admit(batch, *await self._queue.get())
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
                     break
+                try:
+                    self._admit(batch, *await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+        while len(batch) < self.max_batch and not self._queue.empty():
+            self._admit(batch, *self._queue.get_nowait())
+
+    async def _serve(self):
+        """Advance all in-flight queries one step at a time until the worker is cancelled."""
+        batch: List[_PendingRun] = []
+        try:
+            while True:
+                await self._fill(batch)
+                if not batch:
+                    continue
+
+                logger.info(f"BatchedSkillAgent advancing {len(batch)} queries")
+                results = await asyncio.gather(
+                    *[self._step(run.state) for run in batch],
+                    return_exceptions=True,
+                )
 
-                if assistant_message.tool_calls:
-                    for j, tool_call in enumerate(assistant_message.tool_calls):
-                        if tool_call.name not in tool_dict:
-                            logger.exception(f"unknown tool_call.name={tool_call.name}")
-                            continue
-
-                        logger.info(
-                            f"round{i + 1}.{j} submit tool_calls={tool_call.name} "
-                            f"argument={tool_call.argument_dict}",
-                        )
-
-                        # Execute the tool via MCP and parse the result.
-                        result = await mcp_client.call_tool(
-                            tool_call.name,
-                            arguments=tool_call.argument_dict,
-                            parse_result=True,
-                        )
-
-                        # Attach the tool result as a TOOL-role message so the LLM
-                        # can see and reason about it in the next step.
-                        messages.append(
-                            Message(
-                                role=Role.TOOL,
-                                tool_call_id=tool_call.id,
-                                content=result,
-                            ),
-                        )
-                        print(result)
+                still_running = []
+                for run, result in zip(batch, results):
+                    if run.future.done():
+                        continue
+                    if isinstance(result, BaseException):
+                        run.future.set_exception(result)
+                    elif result or run.state.step >= self.max_steps:
+                        run.future.set_result(run.state.messages)
+                    else:
+                        still_running.append(run)
+                batch = still_running
+        finally:
+            for run in batch:
+                if not run.future.done():
+                    run.future.set_exception(RuntimeError("BatchedSkillAgent disconnected"))
@@ -24,6 +24,8 @@ Important:
 - Only load skills and additional resources when they are directly relevant to the current task
 - When running skill scripts, always use absolute paths instead of relative paths when creating the shell commands
 - If a task requires multiple skills, load and apply them sequentially as needed
+- When several tool calls do not depend on each other's results (e.g., loading two skills), issue them together in
+  a single response; skill and reference loads are executed in parallel, shell commands one by one in the order given
 """
 
 SYSTEM_PROMPT_ZH = """
@@ -46,4 +48,5 @@ SYSTEM_PROMPT_ZH = """
 - 仅在当前任务直接相关时，才加载技能和额外资源。
 - 运行技能脚本时，始终使用绝对路径而不是相对路径来创建 shell 命令
 - 如果一个任务需要多个技能，请按需依次加载并应用它们。
+- 当多个工具调用互不依赖彼此的结果时（例如同时加载两个技能），请在同一次回复中一并发起；技能与参考文件的加载会被并行执行，shell 命令则按给出的顺序依次执行。
 """